@@ -116,16 +116,16 @@ def prep_image(im0):
     new_image, sky:
         The image with new background level and the background level
     """
-    im = im0.copy()
-
     # need no zero pixels and sky value
-    im_min = im.min()
-    im_max = im.max()
+    im_min = im0.min()
+    im_max = im0.max()
 
     desired_minval = 0.001 * (im_max - im_min)
 
     sky = desired_minval - im_min
-    im += sky
+
+    # the new image is made with the sky added, rather than copying first
+    im = im0 + sky
 
     return im, sky
 
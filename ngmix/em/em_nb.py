@@ -221,10 +221,12 @@ def do_scratch_sums(pixel, gmix_conv, sums, ngauss_psf, taudata):
 
             chi2 = gauss['dcc']*v2 + gauss['drr']*u2 - 2.0*gauss['drc']*uv
 
-            if chi2 < 25.0 and chi2 >= 0.0:
-                val = gauss['pnorm']*fexp(-0.5*chi2) * pixel['area']
-            else:
-                val = 0.0
+            if not (chi2 < 25.0 and chi2 >= 0.0):
+                # beyond 5 sigma the value is treated as zero, so this
+                # gaussian adds nothing to the sums for this pixel
+                continue
+
+            val = gauss['pnorm']*fexp(-0.5*chi2) * pixel['area']
 
             tsums['gi'] += val
             gsum += val
@@ -236,7 +238,7 @@ def do_scratch_sums(pixel, gmix_conv, sums, ngauss_psf, taudata):
             tsums['tuvsum'] += uv*val
             tsums['tu2sum'] += u2*val
 
-            logL += val*(ttau['logtau'] - 0.5*ttau['logdet'] - 0.5*chi2)
+            logL += val*(ttau['logconst'] - 0.5*chi2)
 
     if gsum == 0.0:
         logL = 0.0
@@ -531,10 +533,12 @@ def do_scratch_sums_fixcen(pixel, gmix_conv, sums, ngauss_psf, taudata):
 
             chi2 = gauss['dcc']*v2 + gauss['drr']*u2 - 2.0*gauss['drc']*uv
 
-            if chi2 < 25.0 and chi2 >= 0.0:
-                val = gauss['pnorm']*fexp(-0.5*chi2) * pixel['area']
-            else:
-                val = 0.0
+            if not (chi2 < 25.0 and chi2 >= 0.0):
+                # beyond 5 sigma the value is treated as zero, so this
+                # gaussian adds nothing to the sums for this pixel
+                continue
+
+            val = gauss['pnorm']*fexp(-0.5*chi2) * pixel['area']
 
             tsums['gi'] += val
             gsum += val
@@ -543,7 +547,7 @@ def do_scratch_sums_fixcen(pixel, gmix_conv, sums, ngauss_psf, taudata):
             tsums['tuvsum'] += uv*val
             tsums['tu2sum'] += u2*val
 
-            logL += val*(ttau['logtau'] - 0.5*ttau['logdet'] - 0.5*chi2)
+            logL += val*(ttau['logconst'] - 0.5*chi2)
 
     if gsum == 0.0:
         logL = 0.0
@@ -658,7 +662,9 @@ def gmix_set_from_sums_fixcen(gmix,
 @njit
 def set_logtau_logdet(gmix, sums):
     """
-    set log(tau) and log(det) for every gaussian
+    set log(tau) and log(det) for every gaussian, as well as the constant
+    part of the log likelihood log(tau) - 0.5*log(det), so it does not need
+    to be recomputed for every pixel
 
     Parameters
     -----------
@@ -673,6 +679,7 @@ def set_logtau_logdet(gmix, sums):
         tsums = sums[i]
         tsums['logtau'] = np.log(gauss['p'])
         tsums['logdet'] = np.log(gauss['det'])
+        tsums['logconst'] = tsums['logtau'] - 0.5*tsums['logdet']
 
 
 @njit
@@ -899,10 +906,12 @@ def do_scratch_sums_fixcov(pixel, gmix_conv, sums, ngauss_psf, taudata):
 
             chi2 = gauss['dcc']*v2 + gauss['drr']*u2 - 2.0*gauss['drc']*uv
 
-            if chi2 < 25.0 and chi2 >= 0.0:
-                val = gauss['pnorm']*fexp(-0.5*chi2) * pixel['area']
-            else:
-                val = 0.0
+            if not (chi2 < 25.0 and chi2 >= 0.0):
+                # beyond 5 sigma the value is treated as zero, so this
+                # gaussian adds nothing to the sums for this pixel
+                continue
+
+            val = gauss['pnorm']*fexp(-0.5*chi2) * pixel['area']
 
             tsums['gi'] += val
             gsum += val
@@ -910,7 +919,7 @@ def do_scratch_sums_fixcov(pixel, gmix_conv, sums, ngauss_psf, taudata):
             tsums['tvsum'] += v*val
             tsums['tusum'] += u*val
 
-            logL += val*(ttau['logtau'] - 0.5*ttau['logdet'] - 0.5*chi2)
+            logL += val*(ttau['logconst'] - 0.5*chi2)
 
     if gsum == 0.0:
         logL = 0.0
@@ -1318,5 +1327,6 @@ def fill_zero_weight_pixels(gmix, pixels, sky):
 _tau_dtype = [
     ('logtau', 'f8'),
     ('logdet', 'f8'),
+    ('logconst', 'f8'),
 ]
 _tau_dtype = np.dtype(_tau_dtype)
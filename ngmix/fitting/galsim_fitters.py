@@ -29,11 +29,15 @@ class GalsimFitter(object):
         be used as a separable prior on center, g, size, flux.
     fit_pars: dict, optional
         parameters for the lm fitter, e.g. maxfev, ftol, xtol
+    parallel: bool, optional
+        If True, fill the residuals for multiple observations in parallel.
+        Default False
     """
 
-    def __init__(self, model, prior=None, fit_pars=None):
+    def __init__(self, model, prior=None, fit_pars=None, parallel=False):
         self.prior = prior
         self.model = model
+        self.parallel = parallel
 
         if fit_pars is not None:
             self.fit_pars = fit_pars.copy()
@@ -52,7 +56,7 @@ class GalsimFitter(object):
             guess=guess,
             n_prior_pars=fit_model.n_prior_pars,
             bounds=fit_model.bounds,
-            k_space=True,
+            ndata=fit_model.totpix,
             **self.fit_pars
         )
 
@@ -63,6 +67,7 @@ class GalsimFitter(object):
     def _make_fit_model(self, obs, guess):
         return GalsimFitModel(
             obs=obs, model=self.model, guess=guess, prior=self.prior,
+            parallel=self.parallel,
         )
 
 
@@ -77,14 +82,19 @@ class GalsimSpergelFitter(GalsimFitter):
         be used as a separable prior on center, g, size, flux.
     fit_pars: dict, optional
         parameters for the lm fitter, e.g. maxfev, ftol, xtol
+    parallel: bool, optional
+        If True, fill the residuals for multiple observations in parallel.
+        Default False
     """
 
-    def __init__(self, prior=None, fit_pars=None):
-        super().__init__(model="spergel", prior=prior, fit_pars=fit_pars)
+    def __init__(self, prior=None, fit_pars=None, parallel=False):
+        super().__init__(
+            model="spergel", prior=prior, fit_pars=fit_pars, parallel=parallel,
+        )
 
     def _make_fit_model(self, obs, guess):
         return GalsimSpergelFitModel(
-            obs=obs, guess=guess, prior=self.prior,
+            obs=obs, guess=guess, prior=self.prior, parallel=self.parallel,
         )
 
 
@@ -101,14 +111,19 @@ class GalsimMoffatFitter(GalsimFitter):
         be used as a separable prior on center, g, size, flux.
     fit_pars: dict, optional
         parameters for the lm fitter, e.g. maxfev, ftol, xtol
+    parallel: bool, optional
+        If True, fill the residuals for multiple observations in parallel.
+        Default False
     """
 
-    def __init__(self, prior=None, fit_pars=None):
-        super().__init__(model="moffat", prior=prior, fit_pars=fit_pars)
+    def __init__(self, prior=None, fit_pars=None, parallel=False):
+        super().__init__(
+            model="moffat", prior=prior, fit_pars=fit_pars, parallel=parallel,
+        )
 
     def _make_fit_model(self, obs, guess):
         return GalsimMoffatFitModel(
-            obs=obs, guess=guess, prior=self.prior,
+            obs=obs, guess=guess, prior=self.prior, parallel=self.parallel,
         )
 
 
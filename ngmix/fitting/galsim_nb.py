@@ -0,0 +1,123 @@
+import numpy
+from numba import njit, prange, int64
+
+
+@njit
+def fill_kfdiff(kmodel, kimage, ierr, fdiff, start):
+    """
+    fill fdiff array with the k space (model-data)/err
+
+    The real parts are stored first, followed by the imaginary parts
+
+    parameters
+    ----------
+    kmodel: 2-d complex array
+        The model k image
+    kimage: 2-d complex array
+        The data k image, same shape as kmodel
+    ierr: 2-d array
+        1/err for each k space pixel, same shape as kmodel
+    fdiff: array
+        Array to fill, should have room for 2*kmodel.size elements
+        starting at index start
+    start: int
+        Starting index in the fdiff array
+    """
+
+    nrow, ncol = kmodel.shape
+    imsize = nrow * ncol
+
+    ifdiff = start
+    for row in range(nrow):
+        for col in range(ncol):
+            diff = kmodel[row, col] - kimage[row, col]
+            pixel_ierr = ierr[row, col]
+
+            fdiff[ifdiff] = diff.real * pixel_ierr
+            fdiff[ifdiff + imsize] = diff.imag * pixel_ierr
+
+            ifdiff += 1
+
+
+@njit
+def fill_kfdiff_half(kmodel, kimage, ierr, fdiff, start):
+    """
+    fill fdiff array with the k space (model-data)/err, using only the
+    independent half of a Hermitian k image
+
+    The images must have odd dimensions and be centered on k=0, so the pixel
+    at flat index i is the complex conjugate of the pixel at npix-1-i.  Only
+    the pixels up to and including the center are used.  The paired pixels
+    are scaled by sqrt(2), so the sum of squares is the same as for the full
+    image.
+
+    The npix//2 + 1 real parts are stored first, followed by the imaginary
+    parts
+
+    parameters
+    ----------
+    kmodel: 2-d complex array
+        The model k image
+    kimage: 2-d complex array
+        The data k image, same shape as kmodel
+    ierr: 2-d array
+        1/err for each k space pixel, same shape as kmodel
+    fdiff: array
+        Array to fill, should have room for 2*(kmodel.size//2 + 1) elements
+        starting at index start
+    start: int
+        Starting index in the fdiff array
+    """
+
+    kmodel_flat = kmodel.ravel()
+    kimage_flat = kimage.ravel()
+    ierr_flat = ierr.ravel()
+
+    # the center pixel is its own conjugate
+    icen = kmodel_flat.size // 2
+    nhalf = icen + 1
+    sqrt2 = numpy.sqrt(2.0)
+
+    for i in range(nhalf):
+        diff = kmodel_flat[i] - kimage_flat[i]
+        pixel_ierr = ierr_flat[i]
+        if i != icen:
+            pixel_ierr *= sqrt2
+
+        fdiff[start + i] = diff.real * pixel_ierr
+        fdiff[start + i + nhalf] = diff.imag * pixel_ierr
+
+
+@njit(parallel=True)
+def fill_kfdiff_parallel(kmodels, kimages, ierrs, starts, fdiff, half):
+    """
+    fill fdiff array with the k space (model-data)/err for a set of
+    observations, processing the observations in parallel
+
+    Each observation must fill a disjoint part of the fdiff array
+
+    parameters
+    ----------
+    kmodels: typed list of 2-d complex arrays
+        The model k images
+    kimages: typed list of 2-d complex arrays
+        The data k images
+    ierrs: typed list of 2-d arrays
+        1/err for each k space pixel
+    starts: array
+        Starting index in the fdiff array for each observation
+    fdiff: array
+        Array to fill
+    half: bool
+        If True, only use the independent half of the Hermitian k images,
+        see fill_kfdiff_half
+    """
+
+    nobs = len(kmodels)
+    for iobs in prange(nobs):
+        # the prange index is unsigned, convert for indexing the typed lists
+        i = int64(iobs)
+        if half:
+            fill_kfdiff_half(kmodels[i], kimages[i], ierrs[i], fdiff, starts[i])
+        else:
+            fill_kfdiff(kmodels[i], kimages[i], ierrs[i], fdiff, starts[i])
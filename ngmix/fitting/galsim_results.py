@@ -3,7 +3,9 @@ __all__ = [
     'GalsimMoffatFitModel', 'GalsimPSFFitModel',
 ]
 import numpy as np
+from numba.typed import List
 from .results import FitModel, PSFFluxFitModel
+from .galsim_nb import fill_kfdiff, fill_kfdiff_half, fill_kfdiff_parallel
 from ..gexceptions import GMixRangeError
 from ..defaults import copy_if_needed, LOWVAL
 from .. import observation
@@ -26,10 +28,20 @@ class GalsimFitModel(FitModel):
     prior: ngmix prior, optional
         For example ngmix.priors.PriorSimpleSep can
         be used as a separable prior on center, g, size, flux.
+    parallel: bool, optional
+        If True, fill the residuals for multiple observations in parallel.
+        Default False
+    half_kspace: bool, optional
+        If True, use only the independent half of Hermitian k images.
+        Default True
     """
 
-    def __init__(self, obs, model, guess, prior=None):
+    def __init__(
+        self, obs, model, guess, prior=None, parallel=False, half_kspace=True,
+    ):
         self.model = model
+        self.parallel = parallel
+        self._allow_half_kspace = half_kspace
         self['model'] = model
         self._set_model_class()
         self._set_prior(prior=prior)
@@ -38,6 +50,7 @@ class GalsimFitModel(FitModel):
         self._set_kobs(obs)
         self._set_n_prior_pars()
         self._set_totpix()
+        self._set_half_kspace()
         self._set_fdiff_size()
         self._init_model_images()
         self._set_band_pars()
@@ -50,46 +63,33 @@ class GalsimFitModel(FitModel):
         vector with (model-data)/error.
 
         The npars elements contain -ln(prior)
+
+        When the k images are Hermitian, only the residuals for the
+        independent half of each k image are stored, see
+        fill_kfdiff_half
         """
 
-        # we cannot keep sending existing array into leastsq, don't know why
-        fdiff = np.zeros(self.fdiff_size)
+        # all elements are overwritten below
+        fdiff = np.empty(self.fdiff_size)
 
         try:
 
             self._fill_models(pars)
 
-            start = self._fill_priors(pars, fdiff)
-
-            for band in range(self.nband):
-
-                kobs_list = self.mb_kobs[band]
-                for kobs in kobs_list:
-
-                    meta = kobs.meta
-                    kmodel = meta["kmodel"]
-                    ierr = meta["ierr"]
-
-                    scratch = meta["scratch"]
-
-                    # model-data
-                    scratch.array[:, :] = kmodel.array[:, :]
-                    scratch -= kobs.kimage
+            self._fill_priors(pars, fdiff)
 
-                    # (model-data)/err
-                    scratch.array.real[:, :] *= ierr.array[:, :]
-                    scratch.array.imag[:, :] *= ierr.array[:, :]
-
-                    # now copy into the full fdiff array
-                    imsize = scratch.array.size
-
-                    fdiff[start:start + imsize] = scratch.array.real.ravel()
-
-                    start += imsize
-
-                    fdiff[start:start + imsize] = scratch.array.imag.ravel()
+            if self._parallel_kfdiff_args is not None:
+                fill_kfdiff_parallel(
+                    *self._parallel_kfdiff_args, fdiff, self._half_kspace,
+                )
+            else:
+                if self._half_kspace:
+                    fill_func = fill_kfdiff_half
+                else:
+                    fill_func = fill_kfdiff
 
-                    start += imsize
+                for kmodel, kimage, ierr, start in self._residual_layout:
+                    fill_func(kmodel, kimage, ierr, fdiff, start)
 
         except GMixRangeError:
             fdiff[:] = LOWVAL
@@ -107,18 +107,15 @@ class GalsimFitModel(FitModel):
                 # pars for this band, in linear space
                 band_pars = self.get_band_pars(pars, band)
 
-                for i, kobs in enumerate(kobs_list):
-
-                    gal = self.make_model(band_pars)
+                # the model is the same for all epochs in this band
+                gal = self.make_model(band_pars)
 
-                    meta = kobs.meta
-
-                    kmodel = meta["kmodel"]
+                for kmodel, psf_karr in self._band_kmodels[band]:
 
                     gal._drawKImage(kmodel)
 
-                    if kobs.has_psf():
-                        kmodel *= kobs.psf.kimage
+                    if psf_karr is not None:
+                        kmodel.array[:, :] *= psf_karr
         except RuntimeError as err:
             raise GMixRangeError(str(err))
 
@@ -228,40 +225,143 @@ class GalsimFitModel(FitModel):
             #                 c1  c2  e1e2  r50  fluxes
             self.n_prior_pars = 1 + 1 + 1 + 1 + self.nband
 
+    def _set_half_kspace(self):
+        """
+        The k images of real images are Hermitian, K(-k) = K(k)^*.  For
+        images centered on k=0 only half of the pixels are independent, so we
+        only need to use the residuals for that half.
+
+        This is done if requested and the data, weight and psf k images for
+        all observations are centered and have the symmetry; the galsim
+        models always do.
+        """
+
+        self._half_kspace = self._allow_half_kspace
+        if not self._half_kspace:
+            return
+
+        for kobs_list in self.mb_kobs:
+            for kobs in kobs_list:
+                if not _is_hermitian(kobs.kimage, kobs.weight):
+                    self._half_kspace = False
+                    return
+
+                if kobs.has_psf() and not _is_hermitian(kobs.psf.kimage):
+                    self._half_kspace = False
+                    return
+
+    def _get_nkfdiff(self, kobs):
+        """
+        the number of fdiff elements used by the residuals for the
+        observation.  Both real and imaginary parts are stored
+        """
+        npix = kobs.kimage.array.size
+        if self._half_kspace:
+            return 2 * (npix // 2 + 1)
+        else:
+            return 2 * npix
+
     def _set_fdiff_size(self):
-        # we have 2*totpix, since we use both real and imaginary
-        # parts
-        self.fdiff_size = self.n_prior_pars + 2 * self.totpix
+        # we use both real and imaginary parts, possibly for only half of
+        # each k image
+        nkfdiff = 0
+        for kobs_list in self.mb_kobs:
+            for kobs in kobs_list:
+                nkfdiff += self._get_nkfdiff(kobs)
+
+        self.fdiff_size = self.n_prior_pars + nkfdiff
+
+    def _make_kmodel(self, kobs):
+        """
+        make the model k image for the observation
+        """
+        import galsim
 
-    def _create_models_in_kobs(self, kobs):
         ex = kobs.kimage
 
-        meta = kobs.meta
-        meta["kmodel"] = ex.copy()
-        meta["scratch"] = ex.copy()
+        # the model is drawn over this, so no need to copy the data
+        return galsim.Image(ex.bounds, dtype=ex.dtype, wcs=ex.wcs)
 
     def _init_model_images(self):
         """
-        add model image entries to the metadata for
-        each observation
+        make the model k images for each observation, these will get
+        filled in.  They are kept with this fit model rather than in the
+        observation metadata, so several fit models can share the same
+        observations.
 
-        these will get filled in
+        The images are stored in _band_kmodels, a list for each band of
+        (kmodel image, psf k array) for each observation.  The psf k array
+        is None if it need not be applied.
+
+        Also set the layout of the residuals in the fdiff array, a flat list
+        of (kmodel array, kimage array, ierr array, start) for each
+        observation, so the residuals can be filled without going through
+        the observations.  The real parts of the residuals are stored
+        starting at start, followed by the imaginary parts, so each
+        observation fills a disjoint slice
         """
 
+        # the priors occupy the first n_prior_pars elements of fdiff
+        start = self.n_prior_pars
+        layout = []
+        band_kmodels = []
+
         for kobs_list in self.mb_kobs:
+            kmodels = []
             for kobs in kobs_list:
-                meta = kobs.meta
+                weight = kobs.weight.array
+                ierr = np.zeros(weight.shape)
+                np.sqrt(weight, out=ierr, where=weight > 0)
+
+                # the psf k image is fixed during the fit, keep a reference
+                # to the underlying array for the model multiply.  A psf k
+                # image that is identically one, e.g. for a delta function
+                # psf, need not be applied
+                psf_karr = None
+                if kobs.has_psf():
+                    psf_karr = kobs.psf.kimage.array
+                    if np.all(psf_karr == 1.0):
+                        psf_karr = None
+
+                kmodel = self._make_kmodel(kobs)
+                kmodels.append((kmodel, psf_karr))
 
-                weight = kobs.weight
-                ierr = weight.copy()
-                ierr.setZero()
+                layout.append(
+                    (kmodel.array, kobs.kimage.array, ierr, start)
+                )
+                start += self._get_nkfdiff(kobs)
 
-                w = np.where(weight.array > 0)
-                if w[0].size > 0:
-                    ierr.array[w] = np.sqrt(weight.array[w])
+            band_kmodels.append(kmodels)
 
-                meta["ierr"] = ierr
-                self._create_models_in_kobs(kobs)
+        self._band_kmodels = band_kmodels
+        self._residual_layout = layout
+        self._set_parallel_kfdiff_args()
+
+    def _set_parallel_kfdiff_args(self):
+        """
+        The residuals for each observation are independent and can be filled
+        in parallel.  This is only done if requested and there are multiple
+        observations, otherwise the args are set to None
+        """
+
+        if not self.parallel or len(self._residual_layout) < 2:
+            self._parallel_kfdiff_args = None
+            return
+
+        kmodels = List()
+        kimages = List()
+        ierrs = List()
+        starts = np.zeros(len(self._residual_layout), dtype='i8')
+
+        for i, (kmodel, kimage, ierr, start) in enumerate(
+            self._residual_layout
+        ):
+            kmodels.append(kmodel)
+            kimages.append(kimage)
+            ierrs.append(ierr)
+            starts[i] = start
+
+        self._parallel_kfdiff_args = (kmodels, kimages, ierrs, starts)
 
     def _check_guess(self, guess):
         """
@@ -276,11 +376,11 @@ class GalsimFitModel(FitModel):
                 "guess, but got %d" % (self.npars, guess.size)
             )
 
-        for band in range(self.nband):
-            band_pars = self.get_band_pars(guess, band)
-            # just doing this to see if an exception is raised. This
-            # will bother flake8
-            gal = self.make_model(band_pars)  # noqa
+        # just doing this to see if an exception is raised. The bands only
+        # differ in the flux, which does not cause galsim errors, so checking
+        # the first band is sufficient. This will bother flake8
+        band_pars = self.get_band_pars(guess, 0)
+        gal = self.make_model(band_pars)  # noqa
 
         return guess
 
@@ -308,6 +408,9 @@ class GalsimFitModel(FitModel):
         npars_band = self.npars - self.nband + 1
         self._band_pars = np.zeros(npars_band)
 
+        # for the round model used in calc_s2n_r
+        self._round_band_pars = np.zeros(npars_band)
+
     def set_fit_result(self, result):
         """
         Get some fit statistics for the input pars.
@@ -330,28 +433,24 @@ class GalsimFitModel(FitModel):
             # pars for this band, in linear space
             band_pars = self.get_band_pars(pars, band)
 
-            for i, kobs in enumerate(kobs_list):
-                meta = kobs.meta
-                weight = kobs.weight
-
-                round_pars = band_pars.copy()
-                round_pars[2:2+2] = 0.0
-                gal = self.make_model(round_pars)
-
-                kmodel = meta["kmodel"]
+            round_pars = self._round_band_pars
+            np.copyto(round_pars, band_pars)
+            round_pars[2:2+2] = 0.0
+            gal = self.make_model(round_pars)
 
+            for kobs, (kmodel, psf_karr) in zip(
+                kobs_list, self._band_kmodels[band],
+            ):
                 gal.drawKImage(image=kmodel)
 
-                if kobs.has_psf():
-                    kmodel *= kobs.psf.kimage
-                kmodel.real.array[:, :] *= kmodel.real.array[:, :]
-                kmodel.imag.array[:, :] *= kmodel.imag.array[:, :]
-
-                kmodel.real.array[:, :] *= weight.array[:, :]
-                kmodel.imag.array[:, :] *= weight.array[:, :]
+                if psf_karr is not None:
+                    kmodel.array[:, :] *= psf_karr
 
-                s2n_sum += kmodel.real.array.sum()
-                s2n_sum += kmodel.imag.array.sum()
+                # sum of |model|^2 * weight, without temporary arrays
+                karr = kmodel.array
+                warr = kobs.weight.array
+                s2n_sum += np.einsum('ij,ij,ij->', karr.real, karr.real, warr)
+                s2n_sum += np.einsum('ij,ij,ij->', karr.imag, karr.imag, warr)
 
         if s2n_sum > 0.0:
             s2n = np.sqrt(s2n_sum)
@@ -375,10 +474,21 @@ class GalsimSpergelFitModel(GalsimFitModel):
     prior: ngmix prior, optional
         For example ngmix.priors.PriorSimpleSep can
         be used as a separable prior on center, g, size, flux.
+    parallel: bool, optional
+        If True, fill the residuals for multiple observations in parallel.
+        Default False
+    half_kspace: bool, optional
+        If True, use only the independent half of Hermitian k images.
+        Default True
     """
 
-    def __init__(self, obs, guess, prior=None):
-        super().__init__(obs=obs, model='spergel', guess=guess, prior=prior)
+    def __init__(
+        self, obs, guess, prior=None, parallel=False, half_kspace=True,
+    ):
+        super().__init__(
+            obs=obs, model='spergel', guess=guess, prior=prior, parallel=parallel,
+            half_kspace=half_kspace,
+        )
 
     def _set_model_class(self):
         import galsim
@@ -438,10 +548,21 @@ class GalsimMoffatFitModel(GalsimFitModel):
     prior: ngmix prior, optional
         For example ngmix.priors.PriorSimpleSep can
         be used as a separable prior on center, g, size, flux.
+    parallel: bool, optional
+        If True, fill the residuals for multiple observations in parallel.
+        Default False
+    half_kspace: bool, optional
+        If True, use only the independent half of Hermitian k images.
+        Default True
     """
 
-    def __init__(self, obs, guess, prior=None):
-        super().__init__(obs=obs, model='moffat', guess=guess, prior=prior)
+    def __init__(
+        self, obs, guess, prior=None, parallel=False, half_kspace=True,
+    ):
+        super().__init__(
+            obs=obs, model='moffat', guess=guess, prior=prior, parallel=parallel,
+            half_kspace=half_kspace,
+        )
 
     def _set_model_class(self):
         import galsim
@@ -639,6 +760,28 @@ class GalsimPSFFitModel(PSFFluxFitModel):
         self.template_list = image_list
 
 
+def _is_hermitian(kimage, weight=None):
+    """
+    check if the k image is centered on k=0 and Hermitian, and if sent that
+    the weight map has the same symmetry
+    """
+    bounds = kimage.bounds
+    if bounds.xmin != -bounds.xmax or bounds.ymin != -bounds.ymax:
+        return False
+
+    karr = kimage.array
+    atol = 1.0e-10 * np.abs(karr).max()
+    if not np.allclose(karr, np.conj(karr[::-1, ::-1]), rtol=0, atol=atol):
+        return False
+
+    if weight is not None:
+        warr = weight.array
+        if not np.array_equal(warr, warr[::-1, ::-1]):
+            return False
+
+    return True
+
+
 def get_galsim_npars(model, nband):
     """
     get number of parameters for a galsim model
@@ -44,6 +44,15 @@ def run_leastsq(func, guess, n_prior_pars, **keys):
         guess at pars
     n_prior_pars:
         number of slots in fdiff for priors
+    ndata: int, optional
+        The number of data points, used for the degrees of freedom.  By
+        default this is the number of non-prior elements of fdiff, or half
+        that if k_space is True
+    k_space: bool, optional
+        If True, and ndata is not sent, the non-prior elements of fdiff are
+        taken to hold the real and imaginary parts of the residuals, so
+        there are half as many data points.  ngmix itself now sends ndata
+        instead; this is kept for external callers.  Default False
     bounds : list, optional
         ``(min, max)`` pairs for each element in ``x``, defining
         the bounds on that parameter. Use None for one of ``min`` or
@@ -62,6 +71,7 @@ def run_leastsq(func, guess, n_prior_pars, **keys):
 
     npars = guess.size
     k_space = keys.pop("k_space", False)
+    ndata = keys.pop("ndata", None)
 
     res = {}
     try:
@@ -93,7 +103,9 @@ def run_leastsq(func, guess, n_prior_pars, **keys):
 
             # npars: to remove priors
 
-            if k_space:
+            if ndata is not None:
+                dof = ndata - npars
+            elif k_space:
                 dof = (fdiff.size - n_prior_pars) // 2 - npars
             else:
                 dof = fdiff.size - n_prior_pars - npars
@@ -81,17 +81,17 @@ def get_flags_str(val, name_map=None):
     if val < 0:
         raise ValueError(f"Flag value {val} must be non-negative.")
 
-    # Cast to uint32 is sufficient given the range of flags.
-    # This is because the second argument to the bitwise AND operator (&) below
-    # would get implicitly cast to the same type as `val`.
-    val = np.array(val, dtype=np.uint32)
+    # Cast to uint32 is sufficient given the range of flags.  Only the first
+    # 31 bits are reported.
+    val = int(np.array(val, dtype=np.uint32)) & (2**31 - 1)
 
+    # visit only the set bits, lowest first
     nstrs = []
-    for pow in range(31):
-        fval = 2**pow
-        if ((val & fval) != 0):
-            if fval in name_map:
-                nstrs.append(name_map[fval])
-            else:
-                nstrs.append("bit 2**%d" % pow)
+    while val:
+        fval = val & -val
+        if fval in name_map:
+            nstrs.append(name_map[fval])
+        else:
+            nstrs.append("bit 2**%d" % (fval.bit_length() - 1))
+        val ^= fval
     return "|".join(nstrs)
@@ -1,8 +1,19 @@
+import functools
 import logging
+import numpy as np
 import ngmix
 
 logger = logging.getLogger(__name__)
 
+# quantities in the moments result that scale with the flux
+_FLUX_SCALED_NAMES = (
+    'flux', 'flux_err', 'sums', 'sums_norm', 'sums_err', 'wsum',
+)
+
+# quantities in the moments result that are not set for a failed
+# measurement, for which the result holds placeholders of a different shape
+_BATCH_FAILURE_NAMES = ('pars', 'sums_err')
+
 
 class GaussMom(object):
     """
@@ -46,6 +57,104 @@ class GaussMom(object):
 
         return res
 
+    def go_batch(self, obs_list):
+        """
+        run moments measurements on a sequence of observations, storing
+        the results in arrays
+
+        The sums are measured for each observation, and the pixel area
+        factor is then applied to all observations at once
+
+        Parameters
+        ----------
+        obs_list: sequence of Observation
+            The observations to measure.  Each observation is measured
+            separately, as for go(obs)
+
+        Returns
+        -------
+        result dictionary of arrays, with one entry per observation.  The
+        flagstr entry is a list of strings.  Quantities not available for an
+        observation, for example due to a failure, are set to NaN
+        """
+
+        nobs = len(obs_list)
+        output = self._make_batch_output(nobs)
+        flagstrs = []
+
+        # area factor for each observation; failures are not rescaled, as
+        # in go(obs)
+        fac = np.ones(nobs)
+
+        for i, obs in enumerate(obs_list):
+            res = self.weight.get_weighted_moments(
+                obs=obs, with_higher_order=self.with_higher_order,
+            )
+
+            for name, arr in output.items():
+                if res['flags'] != 0 and name in _BATCH_FAILURE_NAMES:
+                    continue
+                arr[i] = res[name]
+
+            if res['flags'] == 0:
+                fac[i] = 1.0/obs.jacobian.area
+
+            flagstrs.append(res['flagstr'])
+
+        # need to take out the pixel area factor since new ngmix is in flux
+        # units
+        for name in _FLUX_SCALED_NAMES:
+            arr = output[name]
+            arr *= fac.reshape((nobs,) + (1,) * (arr.ndim - 1))
+
+        output['pars'][:, 5] *= fac
+        output['sums_cov'] *= (fac*fac)[:, np.newaxis, np.newaxis]
+
+        output['flagstr'] = flagstrs
+        return output
+
+    def _make_batch_output(self, nobs):
+        """
+        make the arrays to hold the results from go_batch
+        """
+        dt = np.dtype(
+            ngmix.gmix.gmix.get_moments_result_dtype(
+                with_higher_order=self.with_higher_order,
+            )
+        )
+
+        shapes = {
+            'wsum': (),
+            'flux': (),
+            'flux_err': (),
+            'T': (),
+            'T_err': (),
+            's2n': (),
+            'e1': (),
+            'e2': (),
+            'e': (2,),
+            'e_err': (2,),
+            'e_cov': (2, 2),
+            # the pars are always the 6 basic moments
+            'pars': (6,),
+            'sums': dt['sums'].shape,
+            'sums_cov': dt['sums_cov'].shape,
+            'sums_err': dt['sums'].shape,
+            'sums_norm': (),
+        }
+
+        output = {}
+        for name in ('flags', 'npix'):
+            output[name] = np.zeros(nobs, dtype=dt[name])
+
+        for name in ('flux_flags', 'T_flags'):
+            output[name] = np.zeros(nobs, dtype='i4')
+
+        for name, shape in shapes.items():
+            output[name] = np.full((nobs,) + shape, np.nan)
+
+        return output
+
     def _measure_moments(self, obs):
         """
         measure weighted moments
@@ -61,34 +170,48 @@ class GaussMom(object):
         # need to take out the pixel area factor since new ngmix is in flux
         # units
         area = obs.jacobian.area
-        fac = 1/area
-        res['flux'] *= fac
-        res['flux_err'] *= fac
-        res['pars'][5] *= fac
-        res["sums"] *= fac
-        res["sums_cov"] *= fac**2
-        res["sums_norm"] *= fac
-        res["wsum"] *= fac
-        res["sums_err"] *= fac
+        fac = 1.0/area
+        fac_sq = fac*fac
+        for name in _FLUX_SCALED_NAMES:
+            res[name] *= fac
+
+        pars = res['pars']
+        pars[5] = pars[5] * fac
+
+        sums_cov = res["sums_cov"]
+        np.multiply(sums_cov, fac_sq, out=sums_cov)
         return res
 
     def _set_mompars(self):
-        T = ngmix.moments.fwhm_to_T(self.fwhm)
+        # the weight only depends on the fwhm and is not modified when
+        # measuring moments, so it is shared between instances
+        self.weight = _get_weight(self.fwhm)
 
-        # the weight is always centered at 0, 0 or the
-        # center of the coordinate system as defined
-        # by the jacobian
 
-        weight = ngmix.GMixModel(
-            [0.0, 0.0, 0.0, 0.0, T, 1.0],
-            'gauss',
-        )
+@functools.lru_cache(maxsize=128)
+def _get_weight(fwhm):
+    """
+    get the gaussian weight for the given fwhm, the result is cached
+    """
+    T = ngmix.moments.fwhm_to_T(fwhm)
+
+    # the weight is always centered at 0, 0 or the
+    # center of the coordinate system as defined
+    # by the jacobian
+
+    weight = ngmix.GMixModel(
+        [0.0, 0.0, 0.0, 0.0, T, 1.0],
+        'gauss',
+    )
+
+    # make the max of the weight 1.0 to get better
+    # fluxes
 
-        # make the max of the weight 1.0 to get better
-        # fluxes
+    weight.set_norms()
+    norm = weight.get_data()['norm'][0]
+    weight.set_flux(1.0/norm)
 
-        weight.set_norms()
-        norm = weight.get_data()['norm'][0]
-        weight.set_flux(1.0/norm)
+    # set the norms now so the weight is not modified when it is used
+    weight.set_norms()
 
-        self.weight = weight
+    return weight
@@ -135,19 +135,12 @@ class GMix(object):
 
         gm = self.get_data()
 
-        n = self._ngauss
-        pars = np.zeros(n * 6)
-        beg = 0
-        for i in range(n):
-            pars[beg + 0] = gm["p"][i]
-            pars[beg + 1] = gm["row"][i]
-            pars[beg + 2] = gm["col"][i]
-            pars[beg + 3] = gm["irr"][i]
-            pars[beg + 4] = gm["irc"][i]
-            pars[beg + 5] = gm["icc"][i]
-
-            beg += 6
-        return pars
+        # copy each field into a column, rather than element by element
+        pars = np.zeros((self._ngauss, 6))
+        for i, name in enumerate(("p", "row", "col", "irr", "irc", "icc")):
+            pars[:, i] = gm[name]
+
+        return pars.ravel()
 
     def get_cen(self):
         """
@@ -416,7 +409,7 @@ class GMix(object):
         Get a new GMix with the same parameters
         """
         gmix = GMix(ngauss=self._ngauss)
-        gmix._data[:] = self._data[:]
+        gmix._data[:] = self._data
         return gmix
 
     def __copy__(self):
@@ -21,7 +21,7 @@ def srandu(nrand=None, *, rng):
     ----------
     nrand: int or None, optional
         Number of samples. If None a scalar is returned, else an array
-    rng: np.random.RandomState
+    rng: np.random.RandomState or np.random.Generator
         The random number generator
 
     Returns
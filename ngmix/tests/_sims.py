@@ -1,3 +1,4 @@
+import functools
 import numpy as np
 
 from ngmix import DiagonalJacobian, Jacobian, GMix, GMixModel
@@ -7,12 +8,22 @@ PIXEL_SCALE = 0.263
 TPSF = 0.27
 
 
+@functools.lru_cache(maxsize=8)
+def _get_centered_jacobian(scale, dims):
+    """
+    get a DiagonalJacobian centered in an image of the given dims, the result
+    is cached.  It is only read when making images, and the Observation makes
+    its own copy, so it is shared between calls
+    """
+    cen = (np.array(dims) - 1.0) / 2.0
+    return DiagonalJacobian(scale=scale, row=cen[0], col=cen[1])
+
+
 def get_ngauss_obs(*, rng, ngauss, noise=0.0, with_psf=False, psf_model='turb'):
 
     counts = 100.0
-    dims = [25, 25]
-    cen = (np.array(dims) - 1.0) / 2.0
-    jacob = DiagonalJacobian(scale=PIXEL_SCALE, row=cen[0], col=cen[1])
+    dims = (25, 25)
+    jacob = _get_centered_jacobian(PIXEL_SCALE, dims)
 
     T_1 = 0.55  # arcsec**2
     if with_psf:
@@ -84,13 +95,14 @@ def get_ngauss_obs(*, rng, ngauss, noise=0.0, with_psf=False, psf_model='turb'):
         psf_ret = get_psf_obs(rng=rng, model=psf_model)
         gmconv = gm.convolve(psf_ret['gmix'])
 
-        im0 = gmconv.make_image(dims, jacobian=jacob)
+        im = gmconv.make_image(dims, jacobian=jacob)
         psf_obs = psf_ret['obs']
     else:
-        im0 = gm.make_image(dims, jacobian=jacob)
+        im = gm.make_image(dims, jacobian=jacob)
         psf_obs = None
 
-    im = im0 + rng.normal(size=im0.shape, scale=noise)
+    # the noiseless image is not kept, so add the noise in place
+    im += rng.normal(size=im.shape, scale=noise)
     obs = Observation(im, jacobian=jacob, psf=psf_obs)
 
     ret = {
@@ -144,14 +156,22 @@ def get_model_obs(
     pars = [0.0, 0.0, g1, g2, T] + [flux]*nband
     gm = GMixModel(pars[0:6], model)
 
+    dims = [32, 32]
+    jcen = (np.array(dims) - 1.0) / 2.0
+
+    if noise == 0.0:
+        wtval = 1.0/1.0e-12
+    else:
+        wtval = 1.0/noise**2
+
+    # the random draws are kept in the same order for each epoch, so the
+    # simulations are unchanged for a given seed
     mbobs = MultiBandObsList()
     for iband in range(nband):
         obslist = ObsList()
         for i in range(nepoch):
 
             off1_pix, off2_pix = rng.uniform(low=-off, high=off, size=2)
-            dims = [32, 32]
-            jcen = (np.array(dims) - 1.0) / 2.0
             jacob = DiagonalJacobian(
                 scale=PIXEL_SCALE,
                 row=jcen[0] + off1_pix,
@@ -173,10 +193,7 @@ def get_model_obs(
             im0 = gmconv.make_image(dims, jacobian=jacob)
 
             im = im0 + rng.normal(size=im0.shape, scale=noise)
-            if noise == 0.0:
-                weight = im*0 + 1.0/1.0e-12
-            else:
-                weight = im*0 + 1.0/noise**2
+            weight = np.full(im.shape, wtval)
 
             obs = Observation(
                 im,
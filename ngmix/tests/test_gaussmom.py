@@ -216,3 +216,51 @@ def test_gaussmom_flags():
         flags[i] = res['flags']
 
     assert np.any(flags != 0)
+
+
+@pytest.mark.parametrize('with_higher_order', [False, True])
+def test_gaussmom_go_batch(with_higher_order):
+    """
+    test the batch results match running go on each observation
+    """
+    rng = np.random.RandomState(seed=8812)
+
+    nobs = 5
+    fwhm = 1.2
+    scale = 0.263
+    dims = [32]*2
+
+    cen = (np.array(dims)-1)/2
+    jacobian = ngmix.DiagonalJacobian(row=cen[0], col=cen[1], scale=scale)
+
+    obj = galsim.Gaussian(fwhm=0.9).withFlux(100)
+    im0 = obj.drawImage(nx=dims[1], ny=dims[0], scale=scale).array
+
+    obs_list = []
+    for i in range(nobs):
+        # the last one is very noisy and should fail
+        if i == nobs-1:
+            noise = 100000
+        else:
+            noise = 0.01
+
+        im = im0 + rng.normal(scale=noise, size=dims)
+        weight = np.zeros(dims) + 1.0/noise**2
+        obs_list.append(
+            Observation(image=im, weight=weight, jacobian=jacobian)
+        )
+
+    fitter = GaussMom(fwhm=fwhm, with_higher_order=with_higher_order)
+    bres = fitter.go_batch(obs_list)
+
+    assert bres['flags'][nobs-1] != 0
+    for i, obs in enumerate(obs_list):
+        res = fitter.go(obs)
+        assert bres['flags'][i] == res['flags']
+        assert bres['flagstr'][i] == res['flagstr']
+        assert np.array_equal(bres['sums'][i], res['sums'])
+        assert np.array_equal(bres['sums_cov'][i], res['sums_cov'])
+
+        if res['flags'] == 0:
+            for name in ['flux', 'flux_err', 'T', 'T_err', 'e', 'e_err', 'pars']:
+                assert np.array_equal(bres[name][i], res[name])
@@ -311,3 +311,139 @@ def test_ml_fitting_galsim_errors():
 
     with pytest.raises(ValueError):
         fitter.go(obs=obs, guess=np.zeros(1000))
+
+
+def test_ml_fitting_galsim_parallel_kfdiff():
+    """
+    the residuals filled in parallel should agree exactly with the serial
+    version
+    """
+    rng = np.random.RandomState(seed=991)
+
+    mbobs = ngmix.MultiBandObsList()
+    for band in range(2):
+        obslist = ngmix.ObsList()
+        for epoch in range(3):
+            obslist.append(_get_obs(rng, noise=1.0e-3))
+        mbobs.append(obslist)
+
+    guess = np.array([0.01, -0.01, 0.1, -0.05, 0.5, 1.0, 1.1])
+
+    gmod = ngmix.fitting.GalsimFitModel(obs=mbobs, model='exp', guess=guess)
+    assert gmod._parallel_kfdiff_args is None
+    fdiff = gmod.calc_fdiff(guess)
+
+    pgmod = ngmix.fitting.GalsimFitModel(
+        obs=mbobs, model='exp', guess=guess, parallel=True,
+    )
+    assert pgmod._parallel_kfdiff_args is not None
+    pfdiff = pgmod.calc_fdiff(guess)
+
+    assert np.array_equal(fdiff, pfdiff)
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_ml_fitting_galsim_shared_kobs(parallel):
+    """
+    fit models built on the same k space observations should not interfere
+    with each other
+    """
+    rng = np.random.RandomState(seed=4417)
+
+    obslist = ngmix.ObsList()
+    for epoch in range(2):
+        obslist.append(_get_obs(rng, noise=1.0e-3))
+
+    guess = np.array([0.01, -0.01, 0.1, -0.05, 0.5, 1.1])
+
+    # reference made from its own k space observations
+    ref_gmod = ngmix.fitting.GalsimFitModel(
+        obs=obslist, model='exp', guess=guess,
+    )
+    ref_fdiff = ref_gmod.calc_fdiff(guess)
+
+    kobs = ngmix.observation.make_kobs(obslist)
+    gmod = ngmix.fitting.GalsimFitModel(
+        obs=kobs, model='exp', guess=guess, parallel=parallel,
+    )
+    other_gmod = ngmix.fitting.GalsimFitModel(
+        obs=kobs, model='dev', guess=guess, parallel=parallel,
+    )
+
+    fdiff = gmod.calc_fdiff(guess)
+    other_gmod.calc_fdiff(guess)
+
+    assert np.array_equal(fdiff, ref_fdiff)
+    assert np.array_equal(gmod.calc_fdiff(guess), ref_fdiff)
+    assert gmod.calc_s2n_r(guess) == ref_gmod.calc_s2n_r(guess)
+
+
+def test_ml_fitting_galsim_half_kspace():
+    """
+    using half of the Hermitian k images should give the same chi^2 as
+    using the full images
+    """
+    rng = np.random.RandomState(seed=1331)
+
+    obs = _get_obs(rng, noise=1.0e-3)
+    guess = np.array([0.01, -0.01, 0.1, -0.05, 0.5, 1.1])
+
+    gmod = ngmix.fitting.GalsimFitModel(obs=obs, model='exp', guess=guess)
+    assert gmod._half_kspace
+    fdiff = gmod.calc_fdiff(guess)
+
+    full_gmod = ngmix.fitting.GalsimFitModel(
+        obs=obs, model='exp', guess=guess, half_kspace=False,
+    )
+    assert not full_gmod._half_kspace
+    full_fdiff = full_gmod.calc_fdiff(guess)
+
+    assert fdiff.size == gmod.totpix + 1
+    assert full_fdiff.size == 2 * gmod.totpix
+    assert np.allclose((fdiff**2).sum(), (full_fdiff**2).sum(), rtol=1.0e-12)
+
+
+@pytest.mark.parametrize('kind', ['even', 'weight', 'psf'])
+def test_ml_fitting_galsim_half_kspace_fallback(kind):
+    """
+    k images without the Hermitian symmetry should use the full k images
+    """
+    rng = np.random.RandomState(seed=8107)
+
+    obs = _get_obs(rng, noise=1.0e-3)
+    kobs = ngmix.observation.make_kobs(obs)[0][0]
+
+    kimage = kobs.kimage.copy()
+    weight = kobs.weight.copy()
+    psf_kimage = kobs.psf.kimage.copy()
+
+    if kind == 'even':
+        # drop the last column, the images are no longer centered on k=0
+        b = kimage.bounds
+        bounds = galsim.BoundsI(b.xmin, b.xmax - 1, b.ymin, b.ymax)
+        kimage = kimage[bounds]
+        weight = weight[bounds]
+        psf_kimage = psf_kimage[bounds]
+    elif kind == 'weight':
+        weight.array[0, 0] = 2 * weight.array.max()
+    else:
+        psf_kimage.array[0, 0] += 0.1 * np.abs(psf_kimage.array).max()
+
+    KObservation = ngmix.observation.KObservation
+    new_kobs = KObservation(
+        kimage, weight=weight, psf=KObservation(psf_kimage),
+    )
+
+    prior = get_prior_galsimfit(model='exp', rng=rng, scale=0.263)
+    guess = np.array([0.01, -0.01, 0.1, -0.05, 0.5, 1.1])
+
+    gmod = ngmix.fitting.GalsimFitModel(
+        obs=new_kobs, model='exp', guess=guess, prior=prior,
+    )
+    full_gmod = ngmix.fitting.GalsimFitModel(
+        obs=new_kobs, model='exp', guess=guess, prior=prior, half_kspace=False,
+    )
+
+    assert not gmod._half_kspace
+    assert gmod.fdiff_size == gmod.n_prior_pars + 2 * gmod.totpix
+    assert np.array_equal(gmod.calc_fdiff(guess), full_gmod.calc_fdiff(guess))